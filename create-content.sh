@@ -7,4 +7,9 @@ cp -r temp/github/learning temp/data/learning
 cp -r temp/github/baldrick-reserve/data temp/data/baldrick-reserve-data
 cp -r temp/github/baldrick-reserve/template temp/data/baldrick-reserve-template
 python script/copy-mac-cli.py
-uv run python script/indexer.py
\ No newline at end of file
+uv run python script/indexer.py
+# Drop any resident daemon still holding the previous index
+uv run python -m baldrick_familiar.daemon --stop
+if command -v ollama >/dev/null 2>&1; then
+  ollama create familiar-gemma -f models/familiar-gemma.Modelfile
+fi
@@ -6,13 +6,17 @@ Generate a Markdown file with the `--help` output of a set of CLI tools.
 - Hardcoded output path and commands list at the top.
 - Each section is fenced in ``` for Markdown.
 - Safe execution with timeouts and graceful error messages.
+- Commands run concurrently; sections keep the sorted command order.
 """
 
+import io
 import os
 import shlex
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
 from typing import List, Tuple, Optional
 
 # =========================
@@ -53,6 +57,7 @@ HELP_COMMANDS.sort()
 HELP_FLAG_DEFAULT = "--help"   # what to append if not present
 RUN_TIMEOUT_SECONDS = 15       # be conservative; adjust as you like
 ENCODING = "utf-8"
+MAX_WORKERS = 8                # help commands run concurrently
 
 # =========================
 # Helper functions
@@ -64,10 +69,14 @@ def normalize_command(cmd: str) -> List[str]:
     Returns a list suitable for subprocess.run (no shell).
     """
     parts = shlex.split(cmd)
-    if any(tok in ("-h", "--help") for tok in parts):
+    if has_help_flag(parts):
         return parts
     return parts + [HELP_FLAG_DEFAULT]
 
+def has_help_flag(parts: List[str]) -> bool:
+    """Return True if the split command already contains -h/--help."""
+    return any(tok in ("-h", "--help") for tok in parts)
+
 def run_help_command(cmd: str, timeout: int = RUN_TIMEOUT_SECONDS) -> Tuple[str, int, Optional[str]]:
     """
     Run a help command (adding --help if needed), capturing stdout/stderr.
@@ -110,30 +119,42 @@ def write_header(f, title: str, commands: List[str]) -> None:
         f.write(f"- `{c}` (section: **{heading}**)\n")
     f.write("\n---\n\n")
 
-def write_help_section(f, section_title: str, command: str, output: str, rc: int) -> None:
-    f.write(f"## {section_title}\n\n")
-    f.write(f"**Command:** `{command if ('-h' in command or '--help' in command) else command + ' ' + HELP_FLAG_DEFAULT}`\n\n")
-    f.write("```text\n")
-    f.write(output.rstrip() + "\n")
-    f.write("```\n\n")
-    f.write("---\n\n")
+def write_help_section(f, section_title: str, command: str, output: str, rc: int,
+                       has_help: bool) -> None:
+    shown = command if has_help else f"{command} {HELP_FLAG_DEFAULT}"
+    f.write("".join([
+        f"## {section_title}\n\n",
+        f"**Command:** `{shown}`\n\n",
+        "```text\n",
+        output.rstrip() + "\n",
+        "```\n\n",
+        "---\n\n",
+    ]))
 
 def main() -> int:
     os.makedirs(DEST_DIR, exist_ok=True)
 
-    with open(DEST_FILE, "w", encoding=ENCODING) as f:
-        write_header(f, "MacOS terminal commands", HELP_COMMANDS)
+    # Commands are independent; run them concurrently, map() keeps the sorted order
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        results = list(ex.map(run_help_command, HELP_COMMANDS))
+
+    # Build the whole document in memory and write it with a single call
+    buf = io.StringIO()
+    write_header(buf, "MacOS terminal commands", HELP_COMMANDS)
+
+    for raw_cmd, (stdout_text, rc, _exe) in zip(HELP_COMMANDS, results):
+        parts = shlex.split(raw_cmd)
+        # Section title uses first token as the "tool" name
+        section_title = parts[0] if parts else raw_cmd
 
-        for raw_cmd in HELP_COMMANDS:
-            # Section title uses first token as the "tool" name
-            section_title = shlex.split(raw_cmd)[0] if raw_cmd.strip() else raw_cmd
-            stdout_text, rc, _exe = run_help_command(raw_cmd)
+        # If a tool prints nothing but returns 0, keep the section informative.
+        if not stdout_text.strip() and rc == 0:
+            stdout_text = "(No output produced by help command.)"
 
-            # If a tool prints nothing but returns 0, keep the section informative.
-            if not stdout_text.strip() and rc == 0:
-                stdout_text = "(No output produced by help command.)"
+        write_help_section(buf, section_title, raw_cmd, stdout_text, rc,
+                           has_help=has_help_flag(parts))
 
-            write_help_section(f, section_title, raw_cmd, stdout_text, rc)
+    Path(DEST_FILE).write_text(buf.getvalue(), encoding=ENCODING)
 
     print(f"Wrote Markdown to: {DEST_FILE}")
     return 0
@@ -6,7 +6,8 @@ It searches recursively under "./temp/github/" for each filename listed in
 FILENAMES, and copies every match into "./temp/data/" using the pattern
 "<sanitized-relative-path>-<filename>". The relative path is taken from the
 match's location under "./temp/github/" and sanitized by replacing path
-separators with "-".
+separators with "-". Destinations with the same mtime and size as their
+source are left untouched.
 
 Logging is printed to stdout.
 """
@@ -57,53 +58,80 @@ def copy_matches(filename: str, src_root: Path, dest_root: Path) -> int:
     Returns:
         The number of files copied.
     """
+    return copy_all_matches([filename], src_root, dest_root)
+
+
+def copy_all_matches(filenames: Iterable[str], src_root: Path, dest_root: Path) -> int:
+    """
+    Like `copy_matches`, but for several filenames in a single walk of
+    `src_root`, so each directory is read once whatever the number of names.
+
+    Returns:
+        The total number of files copied.
+    """
     if not src_root.exists():
         print(f"[WARN] Source root does not exist: {src_root}")
         return 0
 
     dest_root.mkdir(parents=True, exist_ok=True)
 
-    copied = 0
-    print(f"[INFO] Searching for '{filename}' under {src_root.resolve()}")
+    wanted = set(filenames)
+    counts = dict.fromkeys(wanted, 0)
+    print(f"[INFO] Searching for {len(wanted)} filename(s) under {src_root.resolve()}")
 
     # Walk the tree without external deps for speed and portability
-    for dirpath, _dirnames, filenames in os.walk(src_root):
-        if filename in filenames:
-            src_path = Path(dirpath) / filename
-            rel_path = src_path.relative_to(src_root)
-            # Remove the trailing filename to get its directory relative path
-            rel_dir = rel_path.parent
-            sanitized = _sanitize(rel_dir)
-            out_name = f"{sanitized}-{filename}" if sanitized else f"{filename}"
-            dest_path = dest_root / out_name
-
-            try:
-                shutil.copy2(src_path, dest_path)
-                copied += 1
-                print(f"[OK]  Copied: {src_path}  ->  {dest_path.name}")
-            except Exception as e:
-                print(f"[ERR] Failed to copy {src_path} -> {dest_path}: {e}")
-
-    print(f"[INFO] Done '{filename}': {copied} file(s) copied.")
-    return copied
+    for dirpath, _dirnames, files in os.walk(src_root):
+        for filename in sorted(wanted.intersection(files)):
+            if _copy_one(Path(dirpath) / filename, filename, src_root, dest_root):
+                counts[filename] += 1
+
+    for filename, copied in sorted(counts.items()):
+        print(f"[INFO] Done '{filename}': {copied} file(s) copied.")
+    return sum(counts.values())
 
 
 def main(filenames: Iterable[str] = FILENAMES,
          src_root: Path = SRC_ROOT,
          dest_root: Path = DEST_ROOT) -> None:
     """
-    Run the collection process over each filename in `filenames`.
+    Run the collection process over all `filenames` in one walk.
     Logs progress and a final summary.
     """
-    total = 0
     print(f"[START] Collecting files into: {dest_root.resolve()}")
-    for name in filenames:
-        total += copy_matches(name, src_root, dest_root)
+    total = copy_all_matches(filenames, src_root, dest_root)
     print(f"[SUMMARY] Total files copied: {total}")
 
 
 # --- Internal helpers (no public docs) ---
 
+def _copy_one(src_path: Path, filename: str, src_root: Path, dest_root: Path) -> bool:
+    rel_path = src_path.relative_to(src_root)
+    # Remove the trailing filename to get its directory relative path
+    sanitized = _sanitize(rel_path.parent)
+    out_name = f"{sanitized}-{filename}" if sanitized else f"{filename}"
+    dest_path = dest_root / out_name
+
+    try:
+        st_src = src_path.stat()
+        # Skip files already copied from this source (same mtime and size)
+        try:
+            st_dest = dest_path.stat()
+            if (st_dest.st_mtime == st_src.st_mtime
+                    and st_dest.st_size == st_src.st_size):
+                print(f"[SKIP] Unchanged: {src_path}  ->  {dest_path.name}")
+                return False
+        except FileNotFoundError:
+            pass
+        # copyfile uses the kernel fast paths; only the times are carried over
+        shutil.copyfile(src_path, dest_path)
+        os.utime(dest_path, ns=(st_src.st_atime_ns, st_src.st_mtime_ns))
+        print(f"[OK]  Copied: {src_path}  ->  {dest_path.name}")
+        return True
+    except Exception as e:
+        print(f"[ERR] Failed to copy {src_path} -> {dest_path}: {e}")
+        return False
+
+
 def _sanitize(rel_dir: Path) -> str:
     s = str(rel_dir).strip()
     if not s or s == ".":
@@ -1,9 +1,11 @@
 from pathlib import Path
 from llama_index.core import VectorStoreIndex, SimpleDirectoryReader, StorageContext, load_index_from_storage
-from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+from baldrick_familiar.cli import build_embed_model
 from llama_index.llms.ollama import Ollama
 DATA_DIR = Path("temp/data")
 INDEX_NAME = "default_index"
+# Texts per tokenizer + forward call; sentence-transformers length-sorts each batch
+EMBED_BATCH_SIZE = 128
 
 APP_DIR = Path.home() / ".baldrick_familiar"
 CACHE_DIR = APP_DIR / "cache" / "llama"
@@ -13,7 +15,9 @@ INDEX_PATH.mkdir(parents=True, exist_ok=True)
 
 documents = SimpleDirectoryReader(DATA_DIR).load_data()
 
-embed_model = HuggingFaceEmbedding(model_name="sentence-transformers/all-MiniLM-L6-v2")
+embed_model = build_embed_model(
+    "sentence-transformers/all-MiniLM-L6-v2", embed_batch_size=EMBED_BATCH_SIZE
+)
 
 index = VectorStoreIndex.from_documents(documents, embed_model=embed_model)
 
@@ -5,7 +5,8 @@ GitHub repo snapshotter (no external libraries).
 Public API:
 - clone_and_detach(full_name: str) -> str
     Clone org/name into ./temp/github/<name> (via `gh` if available, else `git clone --depth=1`),
-    then remove the 'origin' remote. Saves the snapshot commit to ./temp/github/commit-<name>.txt.
+    optionally as a sparse blobless clone (see SPARSE_PATTERNS), then remove the 'origin' remote.
+    Saves the snapshot commit to ./temp/github/commit-<name>.txt.
     Returns the snapshot commit SHA.
 
 - remote_has_commit(full_name: str, commit: str) -> bool
@@ -13,12 +14,14 @@ Public API:
 
 - main()
     For each repo in REPOS, clone if we don't have a saved commit or if it differs from the remote.
+    Repos are processed concurrently (up to MAX_WORKERS at a time).
 """
 
 import logging
 import os
 import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Tuple
 
@@ -34,11 +37,16 @@ REPOS = [
     "flarebyte/overview"
 ]
 BASE_DIR = Path("./temp/github")  # working root for downloads and commit files
+MAX_WORKERS = 8  # repos processed concurrently
+# Optional sparse checkout: None clones the full tree (needed by create-content.sh,
+# which copies whole folders). A list of gitignore-style patterns such as
+# ["README.md", "docs/"] does a blobless partial clone and only checks those out.
+SPARSE_PATTERNS: Optional[list] = None
 # ----------------------------------
 
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s | %(levelname)-8s | %(message)s",
+    format="%(asctime)s | %(levelname)-8s | %(threadName)s | %(message)s",
 )
 
 
@@ -99,6 +107,7 @@ def _remote_url(full_name: str) -> str:
 
 
 def _remote_default_branch(full_name: str) -> Optional[str]:
+    # Debug helper only; not used when checking for updates
     # Use: git ls-remote --symref <url> HEAD  -> output contains "ref: refs/heads/<branch>\tHEAD"
     url = _remote_url(full_name)
     rc, out, err = _run(["git", "ls-remote", "--symref", url, "HEAD"])
@@ -119,23 +128,28 @@ def _remote_default_branch(full_name: str) -> Optional[str]:
 
 
 def _remote_head_commit(full_name: str) -> Optional[str]:
-    branch = _remote_default_branch(full_name)
+    # HEAD resolves to the default branch tip, so one round-trip is enough:
+    # git ls-remote <url> HEAD -> "<sha>\tHEAD"
     url = _remote_url(full_name)
-    ref = branch if branch else "HEAD"
-    # git ls-remote <url> <ref> -> "<sha>\t<ref>"
-    rc, out, err = _run(["git", "ls-remote", url, ref])
+    rc, out, err = _run(["git", "ls-remote", url, "HEAD"])
     if rc != 0 or not out.strip():
         logging.warning(
             "Failed to read remote head for %s: %s", full_name, (err or out).strip()
         )
         return None
-    first_line = out.splitlines()[0].strip()
-    sha = first_line.split("\t")[0].strip()
-    if len(sha) == 40:
-        return sha
+    for line in out.splitlines():
+        parts = line.strip().split("\t")
+        if len(parts) == 2 and parts[1] == "HEAD" and len(parts[0]) == 40:
+            return parts[0]
     return None
 
 
+def _sparse_clone_flags() -> list:
+    if not SPARSE_PATTERNS:
+        return []
+    return ["--filter=blob:none", "--sparse"]
+
+
 def clone_and_detach(full_name: str) -> str:
     """Clone repo into ./temp/github/<name>, record the snapshot commit, and remove the remote."""
     _ensure_dirs()
@@ -151,6 +165,7 @@ def clone_and_detach(full_name: str) -> str:
         # Prefer GitHub CLI; pass git flags after --
         rc, out, err = _run(
             ["gh", "repo", "clone", full_name, str(target_dir), "--", "--depth=1"]
+            + _sparse_clone_flags()
         )
         if rc != 0:
             logging.warning(
@@ -160,12 +175,25 @@ def clone_and_detach(full_name: str) -> str:
 
     if not gh_path:
         url = _remote_url(full_name)
-        rc, out, err = _run(["git", "clone", "--depth=1", url, str(target_dir)])
+        rc, out, err = _run(
+            ["git", "clone", "--depth=1", *_sparse_clone_flags(), url, str(target_dir)]
+        )
         if rc != 0:
             raise RuntimeError(
                 f"git clone failed for {full_name}: {(err or out).strip()}"
             )
 
+    if SPARSE_PATTERNS:
+        # --no-cone so file patterns (e.g. README.md) match at any depth
+        rc, out, err = _run(
+            ["git", "sparse-checkout", "set", "--no-cone", *SPARSE_PATTERNS],
+            cwd=target_dir,
+        )
+        if rc != 0:
+            raise RuntimeError(
+                f"sparse-checkout failed for {full_name}: {(err or out).strip()}"
+            )
+
     # Determine snapshot commit (HEAD of cloned checkout)
     rc, out, err = _run(["git", "rev-parse", "HEAD"], cwd=target_dir)
     if rc != 0:
@@ -232,16 +260,24 @@ def main() -> None:
             "No repositories configured in REPOS. Add entries like 'org/name'."
         )
         return
-    for full_name in REPOS:
-        try:
-            logging.info("Processing %s ...", full_name)
-            if _needs_clone(full_name):
-                sha = clone_and_detach(full_name)
-                logging.info("Cloned %s at %s.", full_name, sha)
-            else:
-                logging.info("Skipping clone for %s (already current).", full_name)
-        except Exception as e:
-            logging.error("Error processing %s: %s", full_name, e)
+    # git calls are network-bound and release the GIL, so threads suffice
+    with ThreadPoolExecutor(
+        max_workers=min(MAX_WORKERS, len(REPOS)), thread_name_prefix="repo"
+    ) as ex:
+        for full_name in REPOS:
+            ex.submit(_process_one, full_name)
+
+
+def _process_one(full_name: str) -> None:
+    try:
+        logging.info("Processing %s ...", full_name)
+        if _needs_clone(full_name):
+            sha = clone_and_detach(full_name)
+            logging.info("Cloned %s at %s.", full_name, sha)
+        else:
+            logging.info("Skipping clone for %s (already current).", full_name)
+    except Exception as e:
+        logging.error("Error processing %s: %s", full_name, e)
 
 
 if __name__ == "__main__":
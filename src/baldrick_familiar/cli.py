@@ -10,12 +10,15 @@ Minimal agent-friendly CLI for querying a persisted LlamaIndex.
 from __future__ import annotations
 from contextlib import redirect_stderr, redirect_stdout
 import os
-import argparse, json, sys
+import argparse, json, re, sys
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Iterator, Optional
 import logging
-from llama_index.embeddings.huggingface import HuggingFaceEmbedding
-from llama_index.llms.ollama import Ollama
+
+if TYPE_CHECKING:
+    # Heavy (torch/transformers); imported lazily where used
+    from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+    from llama_index.llms.ollama import Ollama
 
 
 APP_DIR = Path.home() / ".baldrick_familiar"
@@ -25,6 +28,12 @@ DEFAULT_INDEX_PATH = CACHE_DIR / "default_index"
 DEFAULT_EMBED_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
 DEFAULT_OLLAMA_MODEL = "gemma3:1b"
 
+# The LLM context is far smaller; cap piped prompts to keep memory bounded
+MAX_STDIN_BYTES = 1 << 20
+
+NOISY_LOGGERS = ("llama_index", "gpt_index", "httpx", "urllib3", "openai")
+_LOGGING_CONFIGURED = False
+
 
 def resolve_index_path(cli_arg: str | None = None) -> Path:
     """Return the index path, using CLI arg if provided, else default."""
@@ -34,7 +43,10 @@ def resolve_index_path(cli_arg: str | None = None) -> Path:
 
 
 def configure_logging(
-    verbose: bool = False, debug: bool = False, level: str | None = None
+    verbose: bool = False,
+    debug: bool = False,
+    level: str | None = None,
+    fmt: str = "%(message)s",  # concise format for CLI output
 ):
     """
     Configure logging for CLI.
@@ -42,7 +54,14 @@ def configure_logging(
     - --verbose: INFO
     - --debug: DEBUG
     - --log-level LEVEL: override manually
+    - fmt: record format (the daemon adds timestamps)
+    Only the first call in a process takes effect.
     """
+    global _LOGGING_CONFIGURED
+    if _LOGGING_CONFIGURED:
+        return
+    _LOGGING_CONFIGURED = True
+
     if level:
         lvl = getattr(logging, level.upper(), logging.WARNING)
     elif debug:
@@ -53,25 +72,15 @@ def configure_logging(
         lvl = logging.WARNING  # default minimum
 
     # Configure root logger
-    logging.basicConfig(
-        level=lvl,
-        format="%(message)s",  # concise format for CLI output
-    )
+    logging.basicConfig(level=lvl, format=fmt)
+
+    # Quiet down noisy libs; child loggers (e.g. llama_index.core) inherit
+    for name in NOISY_LOGGERS:
+        logger = logging.getLogger(name)
+        logger.setLevel(lvl)
+        logger.propagate = False
+
 
-    # Quiet down noisy libs
-    for name in (
-        "llama_index",
-        "llama_index.core",
-        "llama_index.core.storage",
-        "llama_index.core.storage.kvstore",
-        "gpt_index",  # legacy
-        "httpx",
-        "urllib3",
-        "openai",
-    ):
-        logging.getLogger(name).setLevel(lvl)
-        logging.getLogger(name).propagate = False
-        
 def load_index_quiet(persist_dir, embed_model, verbose=False, debug=False):
     from llama_index.core import StorageContext, load_index_from_storage
     # only silence when not verbose/debug
@@ -84,6 +93,143 @@ def load_index_quiet(persist_dir, embed_model, verbose=False, debug=False):
         return load_index_from_storage(storage, embed_model=embed_model)
     
 
+def build_embed_model(
+    model_name: str, embed_batch_size: int | None = None, compile: bool = False
+) -> HuggingFaceEmbedding:
+    """
+    Return a HuggingFace embedder, in half precision where the device runs it
+    natively (see `_embed_dtype`) and float32 otherwise.
+
+    Half-precision token embeddings are upcast to float32 before pooling and
+    normalisation.
+    `embed_batch_size` overrides how many texts go through each forward pass.
+    `compile` wraps the backbone in torch.compile (dynamic shapes); the first
+    call is slow, so it only pays off in a long-lived process.
+    """
+    import torch
+    from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+
+    dtype = _embed_dtype(torch)
+    embed_kwargs = {}
+    if embed_batch_size is not None:
+        embed_kwargs["embed_batch_size"] = embed_batch_size
+    if dtype != torch.float32:
+        embed_kwargs["model_kwargs"] = {"dtype": dtype}
+    embed = HuggingFaceEmbedding(model_name=model_name, **embed_kwargs)
+    # First module of the SentenceTransformer is the transformer backbone
+    backbone = embed._model[0]
+    if dtype != torch.float32:
+        backbone.register_forward_hook(_upcast_token_embeddings)
+    if compile:
+        backbone.auto_model = torch.compile(backbone.auto_model, dynamic=True)
+    return embed
+
+
+def _embed_dtype(torch):
+    # Mirrors HuggingFaceEmbedding's device pick: CUDA, then MPS, then CPU.
+    # CPUs often lack fast bf16 kernels and MPS needs macOS 14+ for bf16.
+    if torch.cuda.is_available():
+        # Native bf16 only (Ampere+); emulated bf16 on older GPUs is slow
+        if torch.cuda.is_bf16_supported(including_emulation=False):
+            return torch.bfloat16
+        return torch.float16
+    if torch.backends.mps.is_available():
+        is_macos_or_newer = getattr(torch.backends.mps, "is_macos_or_newer", None)
+        if is_macos_or_newer is not None and is_macos_or_newer(14, 0):
+            return torch.bfloat16
+    return torch.float32
+
+
+def _upcast_token_embeddings(_module, _inputs, features: dict) -> dict:
+    features["token_embeddings"] = features["token_embeddings"].float()
+    return features
+
+
+def build_llm(
+    model: str,
+    max_tokens: int | None = None,
+    temperature: float | None = None,
+    keep_alive: str | None = None,
+) -> Ollama:
+    """Return an Ollama LLM configured with the optional CLI overrides."""
+    from llama_index.llms.ollama import Ollama
+
+    llm_kwargs = {}
+    if max_tokens is not None:
+        llm_kwargs["num_ctx"] = max_tokens  # Ollama uses num_ctx; adjust if desired
+    if temperature is not None:
+        llm_kwargs["temperature"] = temperature
+    if keep_alive is not None:
+        # how long Ollama keeps the model loaded
+        llm_kwargs["keep_alive"] = parse_keep_alive(keep_alive)
+    return Ollama(model=model, **llm_kwargs)
+
+
+def parse_keep_alive(value: str) -> str | int:
+    """
+    Return `value` as whole seconds if it is an integer (e.g. "-1"), else
+    unchanged. Ollama only accepts unit-less durations as JSON numbers.
+    """
+    if re.fullmatch(r"-?\d+", value.strip()):
+        return int(value)
+    return value  # duration string such as "24h"
+
+
+def format_response(
+    prompt: str,
+    response: str,
+    fmt: str,
+    index_path: Path,
+    embed_model: str,
+    llm_model: str,
+) -> str:
+    """Render a query response as plain text or a JSON payload."""
+    if fmt == "json":
+        payload = {
+            "prompt": prompt,
+            "response": response,
+            "metadata": {
+                "index_path": str(index_path.resolve()),
+                "embed_model": embed_model,
+                "llm_model": llm_model,
+            },
+        }
+        return json.dumps(payload, ensure_ascii=False)
+    return response
+
+
+def answer(
+    index,
+    llm: Ollama,
+    prompt: str,
+    fmt: str,
+    index_path: Path,
+    embed_model: str,
+    llm_model: str,
+) -> Iterator[str]:
+    """
+    Query `index` and yield the rendered output, ending with a newline.
+
+    Text output streams token by token as Ollama generates it; JSON output
+    needs the full response, so it is yielded as a single chunk.
+    """
+    if fmt == "text":
+        qe = index.as_query_engine(llm=llm, streaming=True)
+        yield from qe.query(prompt).response_gen
+        yield "\n"
+        return
+    qe = index.as_query_engine(llm=llm)
+    response = qe.query(prompt)
+    yield format_response(
+        prompt,
+        str(response),
+        fmt=fmt,
+        index_path=index_path,
+        embed_model=embed_model,
+        llm_model=llm_model,
+    ) + "\n"
+
+
 def build_arg_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(
         prog="familiar",
@@ -125,6 +271,21 @@ def build_arg_parser() -> argparse.ArgumentParser:
         default=None,
         help="Optional temperature for the LLM.",
     )
+    p.add_argument(
+        "--keep-alive",
+        default=None,
+        help="How long Ollama keeps the model loaded after the query (e.g. 24h, -1 for forever).",
+    )
+    p.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Start a background daemon that keeps the model and index loaded for later queries.",
+    )
+    p.add_argument(
+        "--compile",
+        action="store_true",
+        help="Compile the embedding model with torch.compile (slow first call; best with --daemon).",
+    )
     p.add_argument("--verbose", "-v", action="store_true", help="Show info-level logs.")
     p.add_argument(
         "--debug", action="store_true", help="Show debug logs for troubleshooting."
@@ -142,66 +303,78 @@ def err(msg: str) -> None:
     print(msg, file=sys.stderr)
 
 
+def out(chunk: str) -> None:
+    sys.stdout.write(chunk)
+    sys.stdout.flush()
+
+
+def read_stdin_prompt(limit: int = MAX_STDIN_BYTES) -> str:
+    """Read at most `limit` bytes of prompt from STDIN, warning if truncated."""
+    raw = sys.stdin.buffer.read(limit + 1)
+    if len(raw) > limit:
+        err(f"Warning: STDIN truncated to {limit} bytes.")
+        raw = raw[:limit]
+    return raw.decode("utf-8", errors="replace").strip()
+
+
 def main() -> int:
     parser = build_arg_parser()
     args = parser.parse_args()
     configure_logging(verbose=args.verbose, debug=args.debug, level=args.log_level)
-    
-    index_path = resolve_index_path(args.index_path)
-
-    # Ensure the directory exists
-    index_path.mkdir(parents=True, exist_ok=True)
-
-    if not index_path.exists():
-        err(f"Index directory not found: {index_path}")
-        return 3
 
     # Resolve prompt
     prompt: Optional[str] = args.prompt
     if args.stdin:
-        prompt = sys.stdin.read().strip()
+        prompt = read_stdin_prompt()
     if not prompt:
         err("No prompt supplied. Provide a positional prompt or use --stdin.")
         return 2  # usage error
 
-    index_path = Path(args.index_path)
+    index_path = resolve_index_path(args.index_path)
     if not index_path.exists():
         err(f"Index directory not found: {index_path}")
         return 3  # missing resource
 
     try:
+        from baldrick_familiar.daemon import query_daemon, spawn_daemon
+
+        # Prefer a resident daemon; it already holds the embedder and index
+        served = query_daemon(
+            {
+                "prompt": prompt,
+                "format": args.format,
+                "index_path": str(index_path),
+                "embed_model": args.embed_model,
+                "model": args.model,
+                "max_tokens": args.max_tokens,
+                "temperature": args.temperature,
+                "keep_alive": args.keep_alive,
+            },
+            write=out,
+        )
+        if served:
+            return 0
+        if args.daemon:
+            spawn_daemon(index_path, args.embed_model, compile=args.compile)
+
         # Build components
-        embed = HuggingFaceEmbedding(model_name=args.embed_model)
-        llm_kwargs = {}
-        if args.max_tokens is not None:
-            llm_kwargs["num_ctx"] = (
-                args.max_tokens
-            )  # Ollama uses num_ctx; adjust if desired
-        if args.temperature is not None:
-            llm_kwargs["temperature"] = args.temperature
-        llm = Ollama(model=args.model, **llm_kwargs)
+        embed = build_embed_model(args.embed_model, compile=args.compile)
+        llm = build_llm(args.model, args.max_tokens, args.temperature, args.keep_alive)
 
         # Load index
         index = load_index_quiet(index_path, embed, verbose=args.verbose, debug=args.debug)
 
         # Query
-        qe = index.as_query_engine(llm=llm)
-        response = qe.query(prompt)
-
-        if args.format == "json":
-            payload = {
-                "prompt": prompt,
-                "response": str(response),
-                "metadata": {
-                    "index_path": str(index_path.resolve()),
-                    "embed_model": args.embed_model,
-                    "llm_model": args.model,
-                },
-            }
-            print(json.dumps(payload, ensure_ascii=False))
-        else:
-            print(str(response))
-
+        for chunk in answer(
+            index,
+            llm,
+            prompt,
+            fmt=args.format,
+            index_path=index_path,
+            embed_model=args.embed_model,
+            llm_model=args.model,
+        ):
+            out(chunk)
         return 0
     except KeyboardInterrupt:
         err("Interrupted.")
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Resident query daemon for the familiar CLI.
+
+Keeps the embedding model and the persisted index loaded in memory and
+answers queries over a Unix domain socket, so repeated `familiar` calls skip
+model initialisation and index loading.
+
+- Start: `python -m baldrick_familiar.daemon` (or `familiar --daemon ...`)
+- Stop: `python -m baldrick_familiar.daemon --stop`
+- Logs go to ~/.baldrick_familiar/familiar-daemon.log when spawned by the CLI
+- The index is reloaded when its files change on disk
+- Protocol: one JSON request line in, JSON reply lines out (output chunks,
+  then a final status)
+- The CLI falls back to loading everything inline when no daemon answers
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import logging
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Iterator
+
+from baldrick_familiar.cli import (
+    APP_DIR,
+    DEFAULT_EMBED_MODEL,
+    DEFAULT_INDEX_PATH,
+    answer,
+    build_embed_model,
+    build_llm,
+    configure_logging,
+    load_index_quiet,
+    resolve_index_path,
+)
+
+
+SOCKET_PATH = APP_DIR / "familiar.sock"
+PID_PATH = APP_DIR / "familiar.pid"  # flock'd by the daemon owning the socket
+LOG_PATH = APP_DIR / "familiar-daemon.log"
+LOG_FORMAT = "%(asctime)s | %(levelname)-8s | %(message)s"
+
+
+class FamiliarDaemon:
+    """Holds the embedder, index and LLM wrappers between requests."""
+
+    def __init__(
+        self,
+        index_path: Path,
+        embed_model: str,
+        compile: bool = False,
+        verbose: bool = False,
+    ):
+        self.index_path = index_path.resolve()
+        self.embed_model = embed_model
+        self.embed = build_embed_model(embed_model, compile=compile)
+        if compile:
+            # Pay the compile cost now rather than on the first user query
+            self.embed.get_text_embedding("warmup")
+        self.verbose = verbose
+        self.index = None
+        self._index_mtime: int | None = None
+        self.reload_if_stale()
+        self._llms: dict[tuple, object] = {}
+
+    def reload_if_stale(self) -> None:
+        """(Re)load the index if its files changed since the last load."""
+        mtime = _index_mtime(self.index_path)
+        if mtime == self._index_mtime:
+            return
+        if self.index is not None:
+            logging.info("Index changed on disk; reloading %s", self.index_path)
+        self.index = load_index_quiet(self.index_path, self.embed, verbose=self.verbose)
+        self._index_mtime = mtime
+
+    def llm(
+        self,
+        model: str,
+        max_tokens: int | None,
+        temperature: float | None,
+        keep_alive: str | None = None,
+    ):
+        """Return the LLM wrapper for these settings, built once per combination."""
+        key = (model, max_tokens, temperature, keep_alive)
+        if key not in self._llms:
+            self._llms[key] = build_llm(model, max_tokens, temperature, keep_alive)
+        return self._llms[key]
+
+    def handle(self, request: dict) -> Iterator[dict]:
+        """
+        Answer one request as a sequence of replies: output chunks followed by
+        a final "ok", or a single "mismatch" if it targets another index.
+        """
+        if (
+            Path(request["index_path"]).resolve() != self.index_path
+            or request["embed_model"] != self.embed_model
+        ):
+            yield {"status": "mismatch"}
+            return
+        # Pick up a rebuilt index (e.g. after script/indexer.py) before answering
+        self.reload_if_stale()
+        llm = self.llm(
+            request["model"],
+            request.get("max_tokens"),
+            request.get("temperature"),
+            request.get("keep_alive"),
+        )
+        # Queries run over the resident index
+        for chunk in answer(
+            self.index,
+            llm,
+            request["prompt"],
+            fmt=request.get("format", "text"),
+            index_path=self.index_path,
+            embed_model=self.embed_model,
+            llm_model=request["model"],
+        ):
+            yield {"status": "chunk", "text": chunk}
+        yield {"status": "ok"}
+
+
+def acquire_lock(pid_path: Path = PID_PATH):
+    """
+    Take an exclusive lock on `pid_path` and record our pid in it.
+
+    Returns the open file (keep it open to hold the lock), or None if another
+    daemon already holds it.
+    """
+    import fcntl  # POSIX only; keep the module importable for the CLI elsewhere
+
+    pid_path.parent.mkdir(parents=True, exist_ok=True)
+    f = open(pid_path, "a+", encoding="utf-8")
+    try:
+        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        f.close()
+        return None
+    f.seek(0)
+    f.truncate()
+    f.write(f"{os.getpid()}\n")
+    f.flush()
+    return f
+
+
+def serve(daemon: FamiliarDaemon, socket_path: Path = SOCKET_PATH) -> None:
+    """
+    Serve requests on `socket_path` until interrupted.
+    Call only while holding the lock from `acquire_lock`.
+    """
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            line = self.rfile.readline()
+            if not line:
+                return
+            try:
+                request = json.loads(line)
+                if request.get("command") == "stop":
+                    self.send({"status": "ok"})
+                    # shutdown() blocks until serve_forever returns; call it off-thread
+                    threading.Thread(target=self.server.shutdown).start()
+                    return
+                for reply in daemon.handle(request):
+                    self.send(reply)
+            except Exception as e:
+                logging.exception("Request failed")
+                self.send({"status": "error", "error": str(e)})
+
+        def send(self, reply: dict) -> None:
+            self.wfile.write(json.dumps(reply, ensure_ascii=False).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    # We hold the lock, so any existing socket belongs to a dead daemon
+    socket_path.unlink(missing_ok=True)
+    with socketserver.UnixStreamServer(str(socket_path), Handler) as server:
+        owned_inode = socket_path.stat().st_ino
+        logging.info("Listening on %s", socket_path)
+        try:
+            server.serve_forever()
+        finally:
+            # Only remove the socket we bound, never a successor's
+            try:
+                if socket_path.stat().st_ino == owned_inode:
+                    socket_path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def query_daemon(
+    request: dict, write: Callable[[str], None], socket_path: Path = SOCKET_PATH
+) -> bool:
+    """
+    Send `request` to a running daemon, passing each output chunk to `write`.
+
+    Returns False when no daemon is listening or it serves a different index,
+    so the caller can fall back to loading everything inline.
+    Raises RuntimeError if the daemon failed while answering.
+    """
+    if not socket_path.exists():
+        return False
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(socket_path))
+    except OSError:
+        sock.close()
+        return False
+    started = False
+    with sock, sock.makefile("rwb") as stream:
+        try:
+            stream.write(json.dumps(request).encode("utf-8") + b"\n")
+            stream.flush()
+        except OSError:
+            return False
+        # Only socket reads are guarded; errors from `write` (e.g. a closed
+        # stdout pipe) propagate to the caller unchanged.
+        for reply in _read_replies(stream):
+            if reply["status"] == "chunk":
+                started = True
+                write(reply["text"])
+            elif reply["status"] == "error":
+                raise RuntimeError(reply["error"])
+            else:
+                return reply["status"] == "ok"
+    if started:
+        raise RuntimeError("Daemon connection lost mid-response.")
+    return False
+
+
+def _read_replies(stream) -> Iterator[dict]:
+    # Ends quietly when the daemon drops the connection
+    try:
+        for line in stream:
+            yield json.loads(line)
+    except OSError:
+        return
+
+
+def stop_daemon(socket_path: Path = SOCKET_PATH) -> bool:
+    """Ask a running daemon to shut down; return True if one acknowledged."""
+    if not socket_path.exists():
+        return False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(socket_path))
+            with sock.makefile("rwb") as stream:
+                stream.write(json.dumps({"command": "stop"}).encode("utf-8") + b"\n")
+                stream.flush()
+                line = stream.readline()
+    except OSError:
+        return False
+    return bool(line) and json.loads(line).get("status") == "ok"
+
+
+def is_running(socket_path: Path = SOCKET_PATH) -> bool:
+    """Return True if something accepts connections on `socket_path`."""
+    if not socket_path.exists():
+        return False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(socket_path))
+        return True
+    except OSError:
+        return False
+
+
+def spawn_daemon(index_path: Path, embed_model: str, compile: bool = False) -> None:
+    """Start a detached daemon process for the given index, unless one is running."""
+    if is_running():
+        return
+    cmd = [
+        sys.executable,
+        "-m",
+        "baldrick_familiar.daemon",
+        "--index-path",
+        str(index_path),
+        "--embed-model",
+        embed_model,
+    ]
+    if compile:
+        cmd.append("--compile")
+    LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(LOG_PATH, "ab") as log:
+        subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            start_new_session=True,
+        )
+
+
+def _index_mtime(index_path: Path) -> int:
+    # Persisting rewrites files in place, so the directory mtime is not enough
+    return max(
+        (p.stat().st_mtime_ns for p in index_path.iterdir() if p.is_file()),
+        default=0,
+    )
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        prog="familiar-daemon",
+        description="Keep the familiar embedding model and index loaded and answer queries over a Unix socket.",
+    )
+    p.add_argument(
+        "--index-path",
+        default=str(DEFAULT_INDEX_PATH),
+        help=f"Path to persisted index directory (default: {DEFAULT_INDEX_PATH}).",
+    )
+    p.add_argument(
+        "--embed-model",
+        default=DEFAULT_EMBED_MODEL,
+        help=f"HuggingFace embedding model (default: {DEFAULT_EMBED_MODEL}).",
+    )
+    p.add_argument(
+        "--compile",
+        action="store_true",
+        help="Compile the embedding model with torch.compile and warm it up at startup.",
+    )
+    p.add_argument(
+        "--stop",
+        action="store_true",
+        help="Stop the running daemon and exit.",
+    )
+    p.add_argument("--verbose", "-v", action="store_true", help="Show debug-level logs.")
+    return p
+
+
+def main() -> int:
+    args = build_arg_parser().parse_args()
+    # Long-lived and usually detached: log lifecycle events with timestamps
+    configure_logging(level="DEBUG" if args.verbose else "INFO", fmt=LOG_FORMAT)
+
+    if args.stop:
+        if stop_daemon():
+            logging.info("Stopped daemon on %s", SOCKET_PATH)
+        return 0
+
+    index_path = resolve_index_path(args.index_path)
+    if not index_path.exists():
+        print(f"Index directory not found: {index_path}", file=sys.stderr)
+        return 3
+
+    # Lock before loading the model so concurrent spawns exit straight away
+    lock = acquire_lock()
+    if lock is None:
+        logging.warning("A daemon is already running (lock held on %s)", PID_PATH)
+        return 0
+    try:
+        daemon = FamiliarDaemon(
+            index_path, args.embed_model, compile=args.compile, verbose=args.verbose
+        )
+        serve(daemon)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        lock.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())